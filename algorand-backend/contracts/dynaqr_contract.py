@@ -1,25 +1,41 @@
 """PyTeal implementation of the DynaQR event platform contract."""
 
-from __future__ import annotations
-
 from typing import Final
 
 from pyteal import (
     And,
     App,
     Assert,
+    BitwiseAnd,
+    BitwiseOr,
     Btoi,
     Bytes,
+    BytesZero,
     Cond,
     Concat,
     Expr,
+    ExtractUint64,
+    For,
     Global,
+    Gtxn,
+    If,
+    InnerTxnBuilder,
     Int,
+    Itob,
+    Log,
+    Not,
     OnComplete,
     Or,
+    Replace,
     Return,
+    ScratchVar,
     Seq,
+    ShiftLeft,
+    Subroutine,
+    TealType,
     Txn,
+    TxnField,
+    TxnType,
 )
 
 
@@ -38,228 +54,495 @@ REFUND_REGISTRATION: Final = Bytes("refund_registration")
 
 # Global aggregate keys -------------------------------------------------------------
 
-EVENT_COUNT_KEY: Final = Bytes("event_count")
-VERSION_KEY: Final = Bytes("contract_version")
-TOTAL_REGISTRATIONS_KEY: Final = Bytes("total_registrations")
-TOTAL_REVENUE_KEY: Final = Bytes("total_revenue")
+TOTALS_KEY: Final = Bytes("totals")
 
+# TOTALS_KEY holds total_registrations and total_revenue as two big-endian
+# uint64 words so both are updated with one read and one write.
 
-# Event-specific suffixes -----------------------------------------------------------
+TOTAL_REGISTRATIONS_OFFSET: Final = 0
+TOTAL_REVENUE_OFFSET: Final = 8
+
+
+# Log records -----------------------------------------------------------------------
+#
+# Statistics nothing on-chain reads are logged for indexers instead of stored.
 
-EVENT_NAME_KEY: Final = Bytes("event_name")
-CURRENT_URL_KEY: Final = Bytes("current_url")
-ACCESS_TYPE_KEY: Final = Bytes("access_type")
-EXPIRY_DATE_KEY: Final = Bytes("expiry_date")
-CREATED_AT_KEY: Final = Bytes("created_at")
-OWNER_KEY: Final = Bytes("owner")
-SCAN_COUNT_KEY: Final = Bytes("scan_count")
-ACTIVE_KEY: Final = Bytes("active")
-TICKET_PRICE_KEY: Final = Bytes("ticket_price")
-MAX_CAPACITY_KEY: Final = Bytes("max_capacity")
-REGISTERED_COUNT_KEY: Final = Bytes("registered_count")
-NFT_ASSET_ID_KEY: Final = Bytes("nft_asset_id")
+VERSION_LOG: Final = Bytes("contract_version:2.0.0")
+EVENT_CREATED_LOG_PREFIX: Final = Bytes("event_created:")
+
+
+# Event-specific suffixes -----------------------------------------------------------
+#
+# Each per-event key is the event id followed by a one-byte tag, keeping keys
+# short so more of the 128-byte key/value budget goes to values. The 64-byte
+# meta value caps event ids at 63 bytes.
+#
+#   0x01 event_name   0x02 current_url   0x03 access_type   0x04 owner   0x05 meta
+
+EVENT_NAME_KEY: Final = Bytes("base16", "01")
+CURRENT_URL_KEY: Final = Bytes("base16", "02")
+ACCESS_TYPE_KEY: Final = Bytes("base16", "03")
+OWNER_KEY: Final = Bytes("base16", "04")
+META_KEY: Final = Bytes("base16", "05")
+
+
+# Packed event metadata -------------------------------------------------------------
+#
+# The fixed-width uint64 fields of an event live in a single 64-byte value under
+# META_KEY, one big-endian word per field at the byte offsets below.
+
+EXPIRY_DATE_OFFSET: Final = 0
+TICKET_PRICE_OFFSET: Final = 8
+MAX_CAPACITY_OFFSET: Final = 16
+CREATED_AT_OFFSET: Final = 24
+SCAN_COUNT_OFFSET: Final = 32
+REGISTERED_COUNT_OFFSET: Final = 40
+NFT_ASSET_ID_OFFSET: Final = 48
+ACTIVE_OFFSET: Final = 56
 
 
 # Local state suffixes --------------------------------------------------------------
+#
+#   0x11 registration_flags   0x12 registration_date   0x13 payment_amount
+#   0x14 nft_asset_id
+
+REG_FLAGS_KEY: Final = Bytes("base16", "11")
+REG_DATE_KEY: Final = Bytes("base16", "12")
+REG_AMOUNT_KEY: Final = Bytes("base16", "13")
+REG_NFT_ASSET_KEY: Final = Bytes("base16", "14")
 
-REG_STATUS_KEY: Final = Bytes("registration_status")
-REG_DATE_KEY: Final = Bytes("registration_date")
-REG_TIER_KEY: Final = Bytes("ticket_tier")
-REG_AMOUNT_KEY: Final = Bytes("payment_amount")
-REG_NFT_KEY: Final = Bytes("nft_minted")
 
+# Packed registration flags ---------------------------------------------------------
+#
+# registration_status occupies bits 0-7, ticket_tier bits 8-15 and nft_minted
+# bit 16 of the uint64 stored under REG_FLAGS_KEY.
 
-# Helper utilities -----------------------------------------------------------------
+REG_STATUS_MASK: Final = Int(0xFF)
+REG_STATUS_CLEAR_MASK: Final = Int(0xFFFF_FFFF_FFFF_FF00)
+REG_TIER_SHIFT: Final = Int(8)
+REG_TIER_MAX: Final = Int(0xFF)
+REG_NFT_MINTED_FLAG: Final = Int(1 << 16)
+
+
+# Shared integer constants ----------------------------------------------------------
+#
+# Reused Int nodes so the AST does not allocate a fresh literal at every site.
+
+ZERO: Final = Int(0)
+ONE: Final = Int(1)
+TWO: Final = Int(2)
+THREE: Final = Int(3)
+FOUR: Final = Int(4)
+
+
+# Helper utilities ------------------------------------------------------------------
 
 
 def event_key(event_id: Expr, suffix: Expr) -> Expr:
     """Compose the global/local state key for the given event."""
 
-    return Concat(event_id, Bytes("::"), suffix)
+    return Concat(event_id, suffix)
+
+
+def packed_uint64(packed: Expr, offset: int) -> Expr:
+    """Read one uint64 field out of a packed byte value."""
 
+    return ExtractUint64(packed, Int(offset))
 
+
+def with_packed_uint64(packed: Expr, offset: int, value: Expr) -> Expr:
+    """Return the packed byte value with one uint64 field replaced."""
+
+    return Replace(packed, Int(offset), Itob(value))
+
+
+def reg_status(flags: Expr) -> Expr:
+    """Read the registration status out of packed registration flags."""
+
+    return BitwiseAnd(flags, REG_STATUS_MASK)
+
+
+def with_reg_status(flags: Expr, status: Expr) -> Expr:
+    """Return the packed registration flags with the status replaced."""
+
+    return BitwiseOr(BitwiseAnd(flags, REG_STATUS_CLEAR_MASK), status)
+
+
+@Subroutine(TealType.uint64)
 def is_event_owner(event_id: Expr) -> Expr:
-    return App.globalGet(event_key(event_id, OWNER_KEY)) == Txn.sender()
+    owner = App.globalGetEx(
+        Global.current_application_id(), event_key(event_id, OWNER_KEY)
+    )
+    return Seq(
+        owner,
+        If(owner.hasValue(), owner.value() == Txn.sender(), ZERO),
+    )
 
 
-def is_event_active(event_id: Expr) -> Expr:
-    expiry = App.globalGet(event_key(event_id, EXPIRY_DATE_KEY))
-    return And(
-        App.globalGet(event_key(event_id, ACTIVE_KEY)) == Int(1),
-        Or(expiry == Int(0), expiry > Global.latest_timestamp()),
+def is_event_active(meta: Expr) -> Expr:
+    expiry = ScratchVar(TealType.uint64)
+    return Seq(
+        expiry.store(packed_uint64(meta, EXPIRY_DATE_OFFSET)),
+        And(
+            packed_uint64(meta, ACTIVE_OFFSET) == ONE,
+            # Events without an expiry skip the latest_timestamp lookup.
+            If(expiry.load() == ZERO, ONE, expiry.load() > Global.latest_timestamp()),
+        ),
     )
 
 
-def has_capacity(event_id: Expr) -> Expr:
-    max_capacity = App.globalGet(event_key(event_id, MAX_CAPACITY_KEY))
-    registered = App.globalGet(event_key(event_id, REGISTERED_COUNT_KEY))
-    return Or(max_capacity == Int(0), registered < max_capacity)
+def has_capacity(meta: Expr) -> Expr:
+    max_capacity = ScratchVar(TealType.uint64)
+    return Seq(
+        max_capacity.store(packed_uint64(meta, MAX_CAPACITY_OFFSET)),
+        Or(
+            max_capacity.load() == ZERO,
+            packed_uint64(meta, REGISTERED_COUNT_OFFSET) < max_capacity.load(),
+        ),
+    )
 
 
 def is_already_registered(event_id: Expr, account: Expr) -> Expr:
-    return App.localGet(account, event_key(event_id, REG_STATUS_KEY)) != Int(0)
+    # Registered accounts always carry a non-zero status, so any set flag counts.
+    return App.localGet(account, event_key(event_id, REG_FLAGS_KEY))
 
 
 def dynamic_qr_contract() -> Expr:
     """Approval program for the DynaQR contract."""
 
     on_create = Seq(
-        App.globalPut(EVENT_COUNT_KEY, Int(0)),
-        App.globalPut(VERSION_KEY, Bytes("2.0.0")),
-        App.globalPut(TOTAL_REGISTRATIONS_KEY, Int(0)),
-        App.globalPut(TOTAL_REVENUE_KEY, Int(0)),
-        Return(Int(1)),
+        Log(VERSION_LOG),
+        App.globalPut(TOTALS_KEY, BytesZero(Int(16))),
+        Return(ONE),
     )
 
-    event_id = Txn.application_args[1]
+    # The method selector and event id are read into scratch once per call and
+    # every handler refers to the cached copies.
+    method = ScratchVar(TealType.bytes)
+    event_id_var = ScratchVar(TealType.bytes)
+    event_id = event_id_var.load()
 
-    existing_owner = App.globalGetEx(
-        Global.current_application_id(), event_key(event_id, OWNER_KEY)
-    )
+    owner_key = ScratchVar(TealType.bytes)
+    existing_owner = App.globalGetEx(Global.current_application_id(), owner_key.load())
 
     create_event_logic = Seq(
         Assert(Txn.application_args.length() >= Int(8)),
+        owner_key.store(event_key(event_id, OWNER_KEY)),
         existing_owner,
-        Assert(existing_owner.hasValue() == Int(0)),
+        Assert(existing_owner.hasValue() == ZERO),
         App.globalPut(event_key(event_id, EVENT_NAME_KEY), Txn.application_args[2]),
         App.globalPut(event_key(event_id, CURRENT_URL_KEY), Txn.application_args[3]),
         App.globalPut(event_key(event_id, ACCESS_TYPE_KEY), Txn.application_args[4]),
-        App.globalPut(event_key(event_id, EXPIRY_DATE_KEY), Btoi(Txn.application_args[5])),
-        App.globalPut(event_key(event_id, TICKET_PRICE_KEY), Btoi(Txn.application_args[6])),
-        App.globalPut(event_key(event_id, MAX_CAPACITY_KEY), Btoi(Txn.application_args[7])),
-        App.globalPut(event_key(event_id, CREATED_AT_KEY), Global.latest_timestamp()),
-        App.globalPut(event_key(event_id, OWNER_KEY), Txn.sender()),
-        App.globalPut(event_key(event_id, SCAN_COUNT_KEY), Int(0)),
-        App.globalPut(event_key(event_id, ACTIVE_KEY), Int(1)),
-        App.globalPut(event_key(event_id, REGISTERED_COUNT_KEY), Int(0)),
-        App.globalPut(event_key(event_id, NFT_ASSET_ID_KEY), Int(0)),
-        App.globalPut(EVENT_COUNT_KEY, App.globalGet(EVENT_COUNT_KEY) + Int(1)),
-        Return(Int(1)),
+        App.globalPut(owner_key.load(), Txn.sender()),
+        App.globalPut(
+            event_key(event_id, META_KEY),
+            Concat(
+                Itob(Btoi(Txn.application_args[5])),  # expiry_date
+                Itob(Btoi(Txn.application_args[6])),  # ticket_price
+                Itob(Btoi(Txn.application_args[7])),  # max_capacity
+                Itob(Global.latest_timestamp()),  # created_at
+                BytesZero(Int(16)),  # scan_count, registered_count
+                Itob(  # nft_asset_id, optional canonical event NFT
+                    If(
+                        Txn.application_args.length() > Int(8),
+                        Btoi(Txn.application_args[8]),
+                        ZERO,
+                    )
+                ),
+                Itob(ONE),  # active
+            ),
+        ),
+        Log(Concat(EVENT_CREATED_LOG_PREFIX, event_id)),
+        Return(ONE),
     )
 
+    # Scratch slots caching the metadata key, the packed metadata and repeated
+    # args so each handler evaluates them once.
+    sender = ScratchVar(TealType.bytes)
+    amount = ScratchVar(TealType.uint64)
+    tier = ScratchVar(TealType.uint64)
+    ticket_payment = ScratchVar(TealType.uint64)
+    meta_key = ScratchVar(TealType.bytes)
+    meta = ScratchVar(TealType.bytes)
+    totals = ScratchVar(TealType.bytes)
+
+    def load_meta() -> Expr:
+        return Seq(
+            meta_key.store(event_key(event_id, META_KEY)),
+            meta.store(App.globalGet(meta_key.load())),
+        )
+
+    def store_meta_field(offset: int, value: Expr) -> Expr:
+        return App.globalPut(
+            meta_key.load(), with_packed_uint64(meta.load(), offset, value)
+        )
+
     register_event_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(4)),
-        Assert(is_event_active(event_id)),
-        Assert(has_capacity(event_id)),
-        Assert(is_already_registered(event_id, Txn.sender()) == Int(0)),
-        App.localPut(Txn.sender(), event_key(event_id, REG_STATUS_KEY), Int(1)),
-        App.localPut(
-            Txn.sender(), event_key(event_id, REG_DATE_KEY), Global.latest_timestamp()
+        Assert(Txn.application_args.length() >= FOUR),
+        sender.store(Txn.sender()),
+        amount.store(Btoi(Txn.application_args[3])),
+        # A paid registration is escrowed by the payment grouped just before
+        # this call, so the stored payment_amount always bounds a real deposit
+        # that refunds can draw on.
+        If(amount.load() > ZERO).Then(
+            Seq(
+                Assert(Txn.group_index() > ZERO),
+                ticket_payment.store(Txn.group_index() - ONE),
+                Assert(Gtxn[ticket_payment.load()].type_enum() == TxnType.Payment),
+                Assert(Gtxn[ticket_payment.load()].sender() == sender.load()),
+                Assert(
+                    Gtxn[ticket_payment.load()].receiver()
+                    == Global.current_application_address()
+                ),
+                Assert(Gtxn[ticket_payment.load()].amount() == amount.load()),
+                Assert(
+                    Gtxn[ticket_payment.load()].close_remainder_to()
+                    == Global.zero_address()
+                ),
+                Assert(
+                    Gtxn[ticket_payment.load()].rekey_to() == Global.zero_address()
+                ),
+            )
         ),
+        load_meta(),
+        Assert(is_event_active(meta.load())),
+        Assert(has_capacity(meta.load())),
+        tier.store(Btoi(Txn.application_args[2])),
+        Assert(tier.load() <= REG_TIER_MAX),
+        Assert(Not(is_already_registered(event_id, sender.load()))),
         App.localPut(
-            Txn.sender(), event_key(event_id, REG_TIER_KEY), Btoi(Txn.application_args[2])
+            sender.load(),
+            event_key(event_id, REG_FLAGS_KEY),
+            BitwiseOr(ShiftLeft(tier.load(), REG_TIER_SHIFT), ONE),
         ),
         App.localPut(
-            Txn.sender(), event_key(event_id, REG_AMOUNT_KEY), Btoi(Txn.application_args[3])
-        ),
-        App.localPut(Txn.sender(), event_key(event_id, REG_NFT_KEY), Int(0)),
-        App.globalPut(
-            event_key(event_id, REGISTERED_COUNT_KEY),
-            App.globalGet(event_key(event_id, REGISTERED_COUNT_KEY)) + Int(1),
+            sender.load(), event_key(event_id, REG_DATE_KEY), Global.latest_timestamp()
         ),
-        App.globalPut(
-            TOTAL_REGISTRATIONS_KEY,
-            App.globalGet(TOTAL_REGISTRATIONS_KEY) + Int(1),
+        App.localPut(sender.load(), event_key(event_id, REG_AMOUNT_KEY), amount.load()),
+        store_meta_field(
+            REGISTERED_COUNT_OFFSET,
+            packed_uint64(meta.load(), REGISTERED_COUNT_OFFSET) + ONE,
         ),
+        totals.store(App.globalGet(TOTALS_KEY)),
         App.globalPut(
-            TOTAL_REVENUE_KEY,
-            App.globalGet(TOTAL_REVENUE_KEY) + Btoi(Txn.application_args[3]),
+            TOTALS_KEY,
+            Concat(
+                Itob(packed_uint64(totals.load(), TOTAL_REGISTRATIONS_OFFSET) + ONE),
+                Itob(packed_uint64(totals.load(), TOTAL_REVENUE_OFFSET) + amount.load()),
+            ),
         ),
-        Return(Int(1)),
+        Return(ONE),
+    )
+
+    # Registration flags are read once through localGetEx; the MaybeValue both
+    # proves the account registered and supplies the flags to rewrite.
+    flags_key = ScratchVar(TealType.bytes)
+    registration = App.localGetEx(
+        sender.load(), Global.current_application_id(), flags_key.load()
     )
 
     confirm_attendance_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(2)),
-        Assert(is_already_registered(event_id, Txn.sender())),
-        App.localPut(Txn.sender(), event_key(event_id, REG_STATUS_KEY), Int(2)),
-        App.globalPut(
-            event_key(event_id, SCAN_COUNT_KEY),
-            App.globalGet(event_key(event_id, SCAN_COUNT_KEY)) + Int(1),
+        sender.store(Txn.sender()),
+        flags_key.store(event_key(event_id, REG_FLAGS_KEY)),
+        registration,
+        Assert(registration.hasValue()),
+        App.localPut(
+            sender.load(), flags_key.load(), with_reg_status(registration.value(), TWO)
+        ),
+        load_meta(),
+        store_meta_field(
+            SCAN_COUNT_OFFSET, packed_uint64(meta.load(), SCAN_COUNT_OFFSET) + ONE
         ),
-        Return(Int(1)),
+        Return(ONE),
     )
 
     mint_nft_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(3)),
-        Assert(is_already_registered(event_id, Txn.sender())),
-        Assert(App.localGet(Txn.sender(), event_key(event_id, REG_STATUS_KEY)) == Int(2)),
-        App.localPut(Txn.sender(), event_key(event_id, REG_NFT_KEY), Int(1)),
-        App.globalPut(event_key(event_id, NFT_ASSET_ID_KEY), Btoi(Txn.application_args[2])),
-        Return(Int(1)),
+        Assert(Txn.application_args.length() >= THREE),
+        sender.store(Txn.sender()),
+        flags_key.store(event_key(event_id, REG_FLAGS_KEY)),
+        registration,
+        # A missing slot reads as zero, so the status check covers registration.
+        Assert(reg_status(registration.value()) == TWO),
+        App.localPut(
+            sender.load(),
+            flags_key.load(),
+            BitwiseOr(registration.value(), REG_NFT_MINTED_FLAG),
+        ),
+        # The minted asset belongs to the attendee, so it lives in local state;
+        # the event-wide nft_asset_id is only set at creation.
+        App.localPut(
+            sender.load(),
+            event_key(event_id, REG_NFT_ASSET_KEY),
+            Btoi(Txn.application_args[2]),
+        ),
+        Return(ONE),
     )
 
     update_url_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(3)),
+        Assert(Txn.application_args.length() >= THREE),
         Assert(is_event_owner(event_id)),
         App.globalPut(event_key(event_id, CURRENT_URL_KEY), Txn.application_args[2]),
-        Return(Int(1)),
+        Return(ONE),
     )
 
     update_ticket_price_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(3)),
+        Assert(Txn.application_args.length() >= THREE),
         Assert(is_event_owner(event_id)),
-        App.globalPut(event_key(event_id, TICKET_PRICE_KEY), Btoi(Txn.application_args[2])),
-        Return(Int(1)),
+        load_meta(),
+        store_meta_field(TICKET_PRICE_OFFSET, Btoi(Txn.application_args[2])),
+        Return(ONE),
     )
 
     deactivate_event_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(2)),
         Assert(is_event_owner(event_id)),
-        App.globalPut(event_key(event_id, ACTIVE_KEY), Int(0)),
-        Return(Int(1)),
+        load_meta(),
+        store_meta_field(ACTIVE_OFFSET, ZERO),
+        Return(ONE),
     )
 
     increment_scan_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(2)),
-        Assert(is_event_active(event_id)),
-        App.globalPut(
-            event_key(event_id, SCAN_COUNT_KEY),
-            App.globalGet(event_key(event_id, SCAN_COUNT_KEY)) + Int(1),
+        load_meta(),
+        Assert(is_event_active(meta.load())),
+        store_meta_field(
+            SCAN_COUNT_OFFSET, packed_uint64(meta.load(), SCAN_COUNT_OFFSET) + ONE
         ),
-        Return(Int(1)),
+        Return(ONE),
     )
 
+    # Refunds arrive as (receiver, amount) pairs in args[2..] and are paid from
+    # the application account in one inner transaction group. Each receiver must
+    # hold a registration for this event (and appear in the accounts array), is
+    # refunded at most what it escrowed when registering, and has its
+    # registration removed so it can neither be refunded twice nor keep
+    # attending.
+    refund_count = ScratchVar(TealType.uint64)
+    refund_total = ScratchVar(TealType.uint64)
+    refund_arg = ScratchVar(TealType.uint64)
+    refund_receiver = ScratchVar(TealType.bytes)
+    refund_amount = ScratchVar(TealType.uint64)
+    amount_key = ScratchVar(TealType.bytes)
+
     refund_registration_logic = Seq(
-        Assert(Txn.application_args.length() >= Int(2)),
+        Assert(Txn.application_args.length() >= FOUR),
+        Assert(BitwiseAnd(Txn.application_args.length(), ONE) == ZERO),
         Assert(is_event_owner(event_id)),
-        App.globalPut(
-            event_key(event_id, REGISTERED_COUNT_KEY),
-            App.globalGet(event_key(event_id, REGISTERED_COUNT_KEY)) - Int(1),
+        refund_count.store((Txn.application_args.length() - TWO) / TWO),
+        refund_total.store(ZERO),
+        flags_key.store(event_key(event_id, REG_FLAGS_KEY)),
+        amount_key.store(event_key(event_id, REG_AMOUNT_KEY)),
+        For(
+            refund_arg.store(TWO),
+            refund_arg.load() < Txn.application_args.length(),
+            refund_arg.store(refund_arg.load() + TWO),
+        ).Do(
+            refund_receiver.store(Txn.application_args[refund_arg.load()]),
+            refund_amount.store(Btoi(Txn.application_args[refund_arg.load() + ONE])),
+            Assert(App.localGet(refund_receiver.load(), flags_key.load())),
+            Assert(
+                refund_amount.load()
+                <= App.localGet(refund_receiver.load(), amount_key.load())
+            ),
+            App.localDel(refund_receiver.load(), flags_key.load()),
+            App.localDel(refund_receiver.load(), event_key(event_id, REG_DATE_KEY)),
+            App.localDel(refund_receiver.load(), amount_key.load()),
+            App.localDel(
+                refund_receiver.load(), event_key(event_id, REG_NFT_ASSET_KEY)
+            ),
+            refund_total.store(refund_total.load() + refund_amount.load()),
+            If(refund_arg.load() == TWO)
+            .Then(InnerTxnBuilder.Begin())
+            .Else(InnerTxnBuilder.Next()),
+            InnerTxnBuilder.SetFields(
+                {
+                    TxnField.type_enum: TxnType.Payment,
+                    TxnField.receiver: refund_receiver.load(),
+                    TxnField.amount: refund_amount.load(),
+                    TxnField.fee: ZERO,
+                }
+            ),
         ),
+        InnerTxnBuilder.Submit(),
+        load_meta(),
+        store_meta_field(
+            REGISTERED_COUNT_OFFSET,
+            packed_uint64(meta.load(), REGISTERED_COUNT_OFFSET) - refund_count.load(),
+        ),
+        totals.store(App.globalGet(TOTALS_KEY)),
         App.globalPut(
-            TOTAL_REGISTRATIONS_KEY,
-            App.globalGet(TOTAL_REGISTRATIONS_KEY) - Int(1),
+            TOTALS_KEY,
+            Concat(
+                Itob(
+                    packed_uint64(totals.load(), TOTAL_REGISTRATIONS_OFFSET)
+                    - refund_count.load()
+                ),
+                Itob(
+                    packed_uint64(totals.load(), TOTAL_REVENUE_OFFSET)
+                    - refund_total.load()
+                ),
+            ),
         ),
-        Return(Int(1)),
+        Return(ONE),
     )
 
-    return Cond(
-        [Txn.application_id() == Int(0), on_create],
-        [Txn.on_completion() == OnComplete.OptIn, Return(Int(1))],
-        [Txn.on_completion() == OnComplete.CloseOut, Return(Int(1))],
-        [Txn.on_completion() == OnComplete.UpdateApplication, Return(Int(0))],
-        [Txn.on_completion() == OnComplete.DeleteApplication, Return(Int(0))],
-        [Txn.application_args[0] == CREATE_EVENT, create_event_logic],
-        [Txn.application_args[0] == REGISTER_EVENT, register_event_logic],
-        [Txn.application_args[0] == CONFIRM_ATTENDANCE, confirm_attendance_logic],
-        [Txn.application_args[0] == MINT_NFT, mint_nft_logic],
-        [Txn.application_args[0] == UPDATE_URL, update_url_logic],
-        [Txn.application_args[0] == UPDATE_TICKET_PRICE, update_ticket_price_logic],
-        [Txn.application_args[0] == DEACTIVATE_EVENT, deactivate_event_logic],
-        [Txn.application_args[0] == INCREMENT_SCAN, increment_scan_logic],
-        [Txn.application_args[0] == REFUND_REGISTRATION, refund_registration_logic],
+    # PyTeal 0.27 cannot lower a Cond to the AVM ``match``/``switch`` opcodes and
+    # the front-end passes plain method names rather than ARC-4 selectors, so
+    # dispatch remains a linear chain of comparisons against the cached selector.
+    dispatch = Seq(
+        method.store(Txn.application_args[0]),
+        # Reading args[1] fails the call when it is missing, which enforces the
+        # two-argument minimum shared by every handler; handlers only assert
+        # tighter bounds.
+        event_id_var.store(Txn.application_args[1]),
+        # Arms are ordered by expected call volume: QR scans first, attendee
+        # flows next, organiser administration last.
+        Cond(
+            [method.load() == INCREMENT_SCAN, increment_scan_logic],
+            [method.load() == REGISTER_EVENT, register_event_logic],
+            [method.load() == CONFIRM_ATTENDANCE, confirm_attendance_logic],
+            [method.load() == MINT_NFT, mint_nft_logic],
+            [method.load() == CREATE_EVENT, create_event_logic],
+            [method.load() == UPDATE_URL, update_url_logic],
+            [method.load() == UPDATE_TICKET_PRICE, update_ticket_price_logic],
+            [method.load() == DEACTIVATE_EVENT, deactivate_event_logic],
+            [method.load() == REFUND_REGISTRATION, refund_registration_logic],
+        ),
+    )
+
+    on_completion = ScratchVar(TealType.uint64)
+
+    return Seq(
+        on_completion.store(Txn.on_completion()),
+        # NoOp calls fall through to the dispatcher in the Else branch rather
+        # than testing an always-true condition.
+        If(Txn.application_id() == ZERO)
+        .Then(on_create)
+        .ElseIf(
+            Or(
+                on_completion.load() == OnComplete.OptIn,
+                on_completion.load() == OnComplete.CloseOut,
+            )
+        )
+        .Then(Return(ONE))
+        .ElseIf(
+            Or(
+                on_completion.load() == OnComplete.UpdateApplication,
+                on_completion.load() == OnComplete.DeleteApplication,
+            )
+        )
+        .Then(Return(ZERO))
+        .Else(dispatch),
     )
 
 
 def clear_state_program() -> Expr:
-    return Return(Int(1))
+    return Return(ONE)
 
 
 if __name__ == "__main__":
-    approval = dynamic_qr_contract()
-    clear = clear_state_program()
-    with open("artifacts/approval.teal", "w", encoding="utf-8") as f:
-        f.write(approval.__teal__()[1])
-    with open("artifacts/clear.teal", "w", encoding="utf-8") as f:
-        f.write(clear.__teal__()[1])
-    print("✅ DynaQR contract generated in ./artifacts")
+    # Build through the deploy script so both entry points share its compile
+    # settings and its source-hash cache of the TEAL artifacts.
+    import runpy
+    from pathlib import Path
+
+    deploy_script = Path(__file__).resolve().parents[1] / "scripts" / "deploy.py"
+    runpy.run_path(str(deploy_script), run_name="__main__")
@@ -20,9 +20,13 @@ submit the contract to the configured network.
 from __future__ import annotations
 
 import argparse
+import base64
+import hashlib
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version as package_version
 from pathlib import Path
 from typing import Optional
 
@@ -35,11 +39,17 @@ from algosdk.transaction import (
 )
 from algosdk.v2client import algod
 from dotenv import load_dotenv
-from pyteal import Mode, compileTeal
+from pyteal import Expr, Mode, OptimizeOptions, compileTeal
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 ARTIFACT_DIR = BASE_DIR / "artifacts"
+CONTRACT_SOURCE = BASE_DIR / "contracts" / "dynaqr_contract.py"
+
+TEAL_VERSION = 10
+# Cancel redundant scratch store/load pairs and pass subroutine arguments on the
+# stack via frame pointers.
+OPTIMIZE_OPTIONS = OptimizeOptions(scratch_slots=True, frame_pointers=True)
 
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
@@ -47,32 +57,62 @@ if str(BASE_DIR) not in sys.path:
 from contracts.dynaqr_contract import clear_state_program, dynamic_qr_contract
 
 
-def write_artifacts() -> dict[str, str]:
-    """Compile approval & clear programs and persist TEAL files."""
-
-    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
-
-    approval_source = compileTeal(
-        dynamic_qr_contract(),
+def compile_program(program: Expr) -> str:
+    return compileTeal(
+        program,
         mode=Mode.Application,
-        version=8,
+        version=TEAL_VERSION,
+        assembleConstants=True,
+        optimize=OPTIMIZE_OPTIONS,
     )
 
-    clear_source = compileTeal(
-        clear_state_program(),
-        mode=Mode.Application,
-        version=8,
-    )
 
-    (ARTIFACT_DIR / "approval.teal").write_text(approval_source, encoding="utf-8")
-    (ARTIFACT_DIR / "clear.teal").write_text(clear_source, encoding="utf-8")
+def contract_source_hash() -> str:
+    """Fingerprint the contract source and the settings used to compile it."""
+
+    digest = hashlib.blake2b(CONTRACT_SOURCE.read_bytes(), digest_size=8)
+    # This script holds compile_program and its optimizer settings, so editing
+    # either invalidates the cached artifacts too.
+    digest.update(Path(__file__).resolve().read_bytes())
+    digest.update(f"pyteal={package_version('pyteal')};version={TEAL_VERSION}".encode())
+    return digest.hexdigest()
+
+
+def write_artifacts() -> dict[str, str]:
+    """Compile approval & clear programs and persist TEAL files.
+
+    Compilation is skipped when the manifest records the same source hash and
+    both TEAL files are still present. Recompiling discards any bytecode
+    assembled from the previous TEAL.
+    """
+
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+
+    approval_path = ARTIFACT_DIR / "approval.teal"
+    clear_path = ARTIFACT_DIR / "clear.teal"
+    manifest_path = ARTIFACT_DIR / "manifest.json"
 
     summary = {
-        "approval": str((ARTIFACT_DIR / "approval.teal").resolve()),
-        "clear": str((ARTIFACT_DIR / "clear.teal").resolve()),
+        "approval": str(approval_path.resolve()),
+        "clear": str(clear_path.resolve()),
     }
 
-    (ARTIFACT_DIR / "manifest.json").write_text(json.dumps(summary, indent=2))
+    source_hash = contract_source_hash()
+    if manifest_path.exists() and approval_path.exists() and clear_path.exists():
+        try:
+            cached = json.loads(manifest_path.read_text())
+        except json.JSONDecodeError:
+            cached = {}
+        if cached.get("source_hash") == source_hash:
+            return summary
+
+    approval_path.write_text(compile_program(dynamic_qr_contract()), encoding="utf-8")
+    clear_path.write_text(compile_program(clear_state_program()), encoding="utf-8")
+    for teal_path in (approval_path, clear_path):
+        teal_path.with_suffix(".bin").unlink(missing_ok=True)
+
+    manifest = {**summary, "source_hash": source_hash}
+    manifest_path.write_text(json.dumps(manifest, indent=2))
     return summary
 
 
@@ -87,15 +127,33 @@ def build_algod_client() -> Optional[algod.AlgodClient]:
     return algod.AlgodClient(token, server, port)
 
 
-def deploy_application(client: algod.AlgodClient) -> tuple[int, str]:
-    approval = compileTeal(dynamic_qr_contract(), Mode.Application, version=8)
-    clear = compileTeal(clear_state_program(), Mode.Application, version=8)
+def assemble_programs(
+    client: algod.AlgodClient, summary: dict[str, str]
+) -> tuple[bytes, bytes]:
+    """Return approval & clear bytecode, reusing binaries already assembled."""
+
+    approval_bin = Path(summary["approval"]).with_suffix(".bin")
+    clear_bin = Path(summary["clear"]).with_suffix(".bin")
+    if approval_bin.exists() and clear_bin.exists():
+        return approval_bin.read_bytes(), clear_bin.read_bytes()
 
-    compiled_approval = client.compile(approval)
-    compiled_clear = client.compile(clear)
+    approval = Path(summary["approval"]).read_text(encoding="utf-8")
+    clear = Path(summary["clear"]).read_text(encoding="utf-8")
 
-    approval_bytes = bytes.fromhex(compiled_approval["result"])
-    clear_bytes = bytes.fromhex(compiled_clear["result"])
+    # Assemble both programs concurrently to overlap the two algod round-trips.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        compiled_approval, compiled_clear = executor.map(client.compile, [approval, clear])
+
+    approval_bytes = base64.b64decode(compiled_approval["result"])
+    clear_bytes = base64.b64decode(compiled_clear["result"])
+
+    approval_bin.write_bytes(approval_bytes)
+    clear_bin.write_bytes(clear_bytes)
+    return approval_bytes, clear_bytes
+
+
+def deploy_application(client: algod.AlgodClient) -> tuple[int, str]:
+    approval_bytes, clear_bytes = assemble_programs(client, write_artifacts())
 
     creator_mnemonic = os.getenv("DEPLOYER_MNEMONIC")
     if not creator_mnemonic:
@@ -106,8 +164,11 @@ def deploy_application(client: algod.AlgodClient) -> tuple[int, str]:
 
     params = client.suggested_params()
 
-    global_schema = StateSchema(num_uints=4, num_byte_slices=0)
-    local_schema = StateSchema(num_uints=5, num_byte_slices=0)
+    # totals and every per-event key (including the packed meta value) are
+    # byte slices. 64 slots hold totals plus five keys per event, which caps an
+    # application at 12 events until event state moves to boxes.
+    global_schema = StateSchema(num_uints=0, num_byte_slices=64)
+    local_schema = StateSchema(num_uints=4, num_byte_slices=0)
 
     txn = ApplicationCreateTxn(
         sender=creator_address,
@@ -1,16 +1,265 @@
-"""Lightweight smoke tests for the DynaQR PyTeal contract."""
+"""Smoke tests for the DynaQR PyTeal contract and localnet refund simulations."""
 
-from pyteal import Mode, compileTeal
+import base64
+import os
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from algosdk import account, constants, encoding, kmd, transaction
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+    TransactionWithSigner,
+)
+from algosdk.logic import get_application_address
+from algosdk.v2client import algod
+from pyteal import Mode, OptimizeOptions, compileTeal
 
 from contracts.dynaqr_contract import clear_state_program, dynamic_qr_contract
 
+# Default AlgoKit localnet endpoints; the simulate tests skip without one.
+LOCALNET_ALGOD = os.getenv("LOCALNET_ALGOD_SERVER", "http://localhost:4001")
+LOCALNET_KMD = os.getenv("LOCALNET_KMD_SERVER", "http://localhost:4002")
+LOCALNET_TOKEN = "a" * 64
+
+EVENT_ID = b"refund-demo"
+TICKET_PRICE = 50_000
+
 
 def test_compile_approval_program() -> None:
-    teal_source = compileTeal(dynamic_qr_contract(), Mode.Application, version=8)
+    teal_source = compileTeal(dynamic_qr_contract(), Mode.Application, version=10)
     assert "create_event" in teal_source
     assert "register_event" in teal_source
 
 
 def test_compile_clear_program() -> None:
-    teal_source = compileTeal(clear_state_program(), Mode.Application, version=8)
+    teal_source = compileTeal(clear_state_program(), Mode.Application, version=10)
     assert teal_source.strip() != ""
+
+
+def test_compile_approval_program_with_optimizer() -> None:
+    teal_source = compileTeal(
+        dynamic_qr_contract(),
+        Mode.Application,
+        version=10,
+        assembleConstants=True,
+        optimize=OptimizeOptions(scratch_slots=True, frame_pointers=True),
+    )
+    assert "intcblock" in teal_source
+    assert "bytecblock" in teal_source
+
+
+@pytest.fixture(scope="module")
+def refund_app() -> dict:
+    """Deploy the contract to a localnet with one event and two paid attendees."""
+
+    client = algod.AlgodClient(LOCALNET_TOKEN, LOCALNET_ALGOD)
+    try:
+        client.status()
+    except Exception:
+        pytest.skip("no localnet algod available")
+
+    faucet = localnet_faucet()
+    owner, attendee, refunded, outsider = (account.generate_account() for _ in range(4))
+    funding = ((owner, 10_000_000), (attendee, 1_000_000))
+    funding += ((refunded, 1_000_000), (outsider, 1_000_000))
+    execute(client, *(payment(client, faucet, addr, amt) for (_, addr), amt in funding))
+
+    create = transaction.ApplicationCreateTxn(
+        owner[1],
+        client.suggested_params(),
+        transaction.OnComplete.NoOpOC,
+        assemble(client, dynamic_qr_contract()),
+        assemble(client, clear_state_program()),
+        transaction.StateSchema(num_uints=0, num_byte_slices=64),
+        transaction.StateSchema(num_uints=4, num_byte_slices=0),
+    )
+    txid = execute(client, (create, owner[0]))[0]
+    app_id = transaction.wait_for_confirmation(client, txid)["application-index"]
+    app_address = get_application_address(app_id)
+
+    execute(
+        client,
+        payment(client, owner, app_address, 1_000_000),
+        (
+            app_call(
+                client,
+                owner,
+                app_id,
+                [b"create_event", EVENT_ID, b"Demo", b"https://example.com", b"public"]
+                + [(0).to_bytes(8, "big")] * 3,
+            ),
+            owner[0],
+        ),
+    )
+    for attendee_key, attendee_address in (attendee, refunded, outsider):
+        execute(
+            client,
+            (
+                transaction.ApplicationOptInTxn(
+                    attendee_address, client.suggested_params(), app_id
+                ),
+                attendee_key,
+            ),
+        )
+    for paid in (attendee, refunded):
+        execute(client, *registration(client, paid, app_id, TICKET_PRICE, TICKET_PRICE))
+
+    return {
+        "client": client,
+        "app_id": app_id,
+        "owner": owner,
+        "attendee": attendee,
+        "refunded": refunded,
+        "outsider": outsider,
+    }
+
+
+def test_refund_rejects_unregistered_receiver(refund_app: dict) -> None:
+    outsider = refund_app["outsider"][1]
+    assert simulate(refund_app, refund(refund_app, outsider, 1))
+
+
+def test_refund_rejects_amount_above_payment(refund_app: dict) -> None:
+    attendee = refund_app["attendee"][1]
+    assert simulate(refund_app, refund(refund_app, attendee, TICKET_PRICE + 1))
+    assert not simulate(refund_app, refund(refund_app, attendee, TICKET_PRICE))
+
+
+def test_refund_rejects_second_refund(refund_app: dict) -> None:
+    refunded = refund_app["refunded"][1]
+    execute(refund_app["client"], refund(refund_app, refunded, TICKET_PRICE))
+    assert simulate(refund_app, refund(refund_app, refunded, TICKET_PRICE))
+
+
+def test_unpaid_registration_cannot_be_refunded(refund_app: dict) -> None:
+    client, app_id = refund_app["client"], refund_app["app_id"]
+    outsider = refund_app["outsider"]
+    # Declaring a price without the grouped payment, or with a short one, fails.
+    unpaid = registration(client, outsider, app_id, TICKET_PRICE, 0)
+    short = registration(client, outsider, app_id, TICKET_PRICE, TICKET_PRICE - 1)
+    assert simulate(refund_app, *unpaid)
+    assert simulate(refund_app, *short)
+    assert simulate(refund_app, refund(refund_app, outsider[1], TICKET_PRICE))
+
+
+def localnet_faucet() -> tuple[str, str]:
+    kmd_client = kmd.KMDClient(LOCALNET_TOKEN, LOCALNET_KMD)
+    wallet_id = next(
+        wallet["id"]
+        for wallet in kmd_client.list_wallets()
+        if wallet["name"] == "unencrypted-default-wallet"
+    )
+    handle = kmd_client.init_wallet_handle(wallet_id, "")
+    try:
+        client = algod.AlgodClient(LOCALNET_TOKEN, LOCALNET_ALGOD)
+        address = max(
+            kmd_client.list_keys(handle),
+            key=lambda addr: client.account_info(addr)["amount"],
+        )
+        return kmd_client.export_key(handle, "", address), address
+    finally:
+        kmd_client.release_wallet_handle(handle)
+
+
+def assemble(client: algod.AlgodClient, program) -> bytes:
+    teal_source = compileTeal(program, Mode.Application, version=10)
+    return base64.b64decode(client.compile(teal_source)["result"])
+
+
+def app_call(
+    client: algod.AlgodClient,
+    sender: tuple[str, str],
+    app_id: int,
+    args: list[bytes],
+    accounts: Optional[list[str]] = None,
+    fee: Optional[int] = None,
+) -> transaction.ApplicationNoOpTxn:
+    params = client.suggested_params()
+    if fee is not None:
+        params.flat_fee = True
+        params.fee = fee
+    return transaction.ApplicationNoOpTxn(
+        sender[1], params, app_id, app_args=args, accounts=accounts
+    )
+
+
+def registration(
+    client: algod.AlgodClient,
+    attendee: tuple[str, str],
+    app_id: int,
+    declared: int,
+    paid: int,
+) -> list[tuple[transaction.Transaction, str]]:
+    args = [b"register_event", EVENT_ID, (0).to_bytes(8, "big")]
+    call = app_call(client, attendee, app_id, args + [declared.to_bytes(8, "big")])
+    group = [(call, attendee[0])]
+    if paid:
+        app_address = get_application_address(app_id)
+        group.insert(0, payment(client, attendee, app_address, paid))
+    return group
+
+
+def refund(
+    app: dict, receiver: str, amount: int
+) -> tuple[transaction.Transaction, str]:
+    owner = app["owner"]
+    call = app_call(
+        app["client"],
+        owner,
+        app["app_id"],
+        [
+            b"refund_registration",
+            EVENT_ID,
+            encoding.decode_address(receiver),
+            amount.to_bytes(8, "big"),
+        ],
+        accounts=[receiver],
+        # The outer call pays the inner refund payment's fee.
+        fee=2 * constants.MIN_TXN_FEE,
+    )
+    return call, owner[0]
+
+
+def payment(
+    client: algod.AlgodClient, sender: tuple[str, str], receiver: str, amount: int
+) -> tuple[transaction.Transaction, str]:
+    params = client.suggested_params()
+    return transaction.PaymentTxn(sender[1], params, receiver, amount), sender[0]
+
+
+def composer(*txns: tuple[transaction.Transaction, str]) -> AtomicTransactionComposer:
+    atc = AtomicTransactionComposer()
+    for txn, private_key in txns:
+        signer = AccountTransactionSigner(private_key)
+        atc.add_transaction(TransactionWithSigner(txn, signer))
+    return atc
+
+
+def execute(
+    client: algod.AlgodClient, *txns: tuple[transaction.Transaction, str]
+) -> list[str]:
+    return composer(*txns).execute(client, 4).tx_ids
+
+
+def simulate(app: dict, *txns: tuple[transaction.Transaction, str]) -> str:
+    """Return the simulated group's failure message, empty when it succeeds."""
+
+    return composer(*txns).simulate(app["client"]).failure_message
+
+
+def test_single_contract_definition() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    skipped = {".git", ".venv", "venv", "node_modules", "dist", "__pycache__"}
+    definitions = []
+    for directory, subdirs, files in os.walk(repo_root):
+        subdirs[:] = [name for name in subdirs if name not in skipped]
+        for name in files:
+            path = Path(directory) / name
+            if path.suffix != ".py":
+                continue
+            lines = path.read_text(encoding="utf-8").splitlines()
+            if any(line.startswith("def dynamic_qr_contract(") for line in lines):
+                definitions.append(path.relative_to(repo_root).as_posix())
+    assert definitions == ["algorand-backend/contracts/dynaqr_contract.py"]
@@ -68,8 +68,8 @@ fi
 # Compile smart contracts
 echo ""
 echo "🔧 Compiling smart contracts..."
-cd src/contracts
-python3 DynamicQRContract.py
+cd algorand-backend
+python3 scripts/deploy.py
 
 if [ $? -eq 0 ]; then
     echo "✅ Smart contracts compiled successfully"
@@ -77,7 +77,7 @@ else
     echo "⚠️  Smart contract compilation failed. This may not affect basic functionality."
 fi
 
-cd ../..
+cd ..
 
 # Check if .env file exists
 if [ ! -f .env ]; then
@@ -31,28 +31,42 @@ const DYNAQR_CONTRACT = {
   }
 };
 
-const EVENT_GLOBAL_SUFFIXES = [
-  'event_name',
-  'current_url',
-  'access_type',
-  'expiry_date',
-  'created_at',
-  'owner',
-  'scan_count',
-  'active',
-  'ticket_price',
-  'max_capacity',
-  'registered_count',
-  'nft_asset_id'
-];
-
-const REGISTRATION_SUFFIXES = [
-  'registration_status',
-  'registration_date',
-  'ticket_tier',
-  'payment_amount',
-  'nft_minted'
-];
+// Per-event global keys are `<event_id><tag>` with a one-byte tag.
+const EVENT_GLOBAL_TAGS: Record<number, string> = {
+  0x01: 'event_name',
+  0x02: 'current_url',
+  0x03: 'access_type',
+  0x04: 'owner',
+  0x05: 'meta'
+};
+
+// Byte offsets of the uint64 fields packed into an event's `meta` value.
+const EVENT_META_OFFSETS = {
+  expiry_date: 0,
+  ticket_price: 8,
+  max_capacity: 16,
+  created_at: 24,
+  scan_count: 32,
+  registered_count: 40,
+  nft_asset_id: 48,
+  active: 56
+};
+
+// Per-event local keys follow the same `<event_id><tag>` layout.
+const REGISTRATION_TAGS: Record<number, string> = {
+  0x11: 'registration_flags',
+  0x12: 'registration_date',
+  0x13: 'payment_amount',
+  0x14: 'nft_asset_id'
+};
+
+// Bit layout of the packed `registration_flags` local state value.
+const REGISTRATION_FLAGS = {
+  statusMask: 0xff,
+  tierShift: 8,
+  tierMask: 0xff,
+  nftMintedBit: 1 << 16
+};
 
 type AccessType = 'public' | 'nft-gated' | 'time-based';
 
@@ -134,6 +148,7 @@ export interface CreateEventPayload {
   tags?: string[];
   organizer?: OrganizerMetadata;
   ticketTiers?: TicketTierMetadata[];
+  nftAssetId?: number;
 }
 
 export interface RegisterEventPayload {
@@ -158,6 +173,7 @@ export interface EventRegistration {
   paymentAmountMicroAlgos?: number;
   paymentAmountAlgos?: number;
   nftMinted?: boolean;
+  nftAssetId?: number;
   metadata?: RegistrationMetadata;
 }
 
@@ -247,6 +263,9 @@ class DynaQRAlgorandService {
         this.encodeArg(ticketPriceMicro.toString()),
         this.encodeArg(maxCapacity.toString())
       ];
+      if (payload.nftAssetId) {
+        appArgs.push(algosdk.encodeUint64(payload.nftAssetId));
+      }
 
       const metadata: EventMetadata = {
         description: payload.description,
@@ -327,26 +346,12 @@ class DynaQRAlgorandService {
       const paymentAmountMicro =
         payload.paymentAmountMicroAlgos ?? payload.paymentAmount ?? 0;
 
-      if (paymentAmountMicro > 0) {
-        const paymentResult = await walletService.sendPayment(
-          event.owner,
-          paymentAmountMicro,
-          `event:${payload.eventId}`
-        );
-
-        if (!paymentResult.success) {
-          return {
-            success: false,
-            error: paymentResult.error || 'Payment transaction failed'
-          };
-        }
-      }
-
+      const amountMicro = Math.max(paymentAmountMicro, 0);
       const appArgs = [
         this.encodeArg(DYNAQR_CONTRACT.methods.REGISTER_EVENT),
         this.encodeArg(payload.eventId),
-        this.encodeArg((ticketTierIndex ?? 0).toString()),
-        this.encodeArg(Math.max(paymentAmountMicro, 0).toString())
+        algosdk.encodeUint64(ticketTierIndex ?? 0),
+        algosdk.encodeUint64(amountMicro)
       ];
 
       const metadata: RegistrationMetadata = {
@@ -368,7 +373,22 @@ class DynaQRAlgorandService {
         appId
       });
 
-      const txResult = await walletService.signAndSendTransaction(txn);
+      // Paid tickets are escrowed by the application, which checks the payment
+      // grouped immediately before the registration call.
+      const group: algosdk.Transaction[] = [txn];
+      if (amountMicro > 0) {
+        group.unshift(
+          algosdk.makePaymentTxnWithSuggestedParamsFromObject({
+            from: account.address,
+            to: algosdk.getApplicationAddress(appId),
+            amount: amountMicro,
+            suggestedParams: await algodClient.getTransactionParams().do(),
+            note: textEncoder.encode(`event:${payload.eventId}`)
+          })
+        );
+      }
+
+      const txResult = await walletService.signAndSendTransaction(group);
 
       if (!txResult.success) {
         return { success: false, error: txResult.error };
@@ -644,12 +664,8 @@ class DynaQRAlgorandService {
 
       const registrations: Record<string, Partial<EventRegistration>> = {};
       keyValues.forEach((entry: any) => {
-        const key = this.decodeStateKey(entry.key);
-        const suffix = REGISTRATION_SUFFIXES.find((s) => key.endsWith(s));
-        if (!suffix) return;
-
-        const eventId = key.slice(0, key.length - suffix.length);
-        if (!eventId) return;
+        const { eventId, suffix } = this.decodeStateKey(entry.key, REGISTRATION_TAGS);
+        if (!suffix || !eventId) return;
 
         const registration = registrations[eventId] || {
           eventId,
@@ -658,22 +674,26 @@ class DynaQRAlgorandService {
         };
 
         switch (suffix) {
-          case 'registration_status':
-            registration.status = this.mapRegistrationStatus(entry.value.uint ?? 0);
+          case 'registration_flags': {
+            const flags = Number(entry.value.uint ?? 0);
+            registration.status = this.mapRegistrationStatus(
+              flags & REGISTRATION_FLAGS.statusMask
+            );
+            registration.ticketTierIndex =
+              (flags >> REGISTRATION_FLAGS.tierShift) & REGISTRATION_FLAGS.tierMask;
+            registration.nftMinted = (flags & REGISTRATION_FLAGS.nftMintedBit) !== 0;
             break;
+          }
           case 'registration_date':
             registration.registrationDate = this.toISOString(entry.value.uint);
             break;
-          case 'ticket_tier':
-            registration.ticketTierIndex = Number(entry.value.uint ?? 0);
-            break;
           case 'payment_amount':
             registration.paymentAmountMicroAlgos = Number(entry.value.uint ?? 0);
             registration.paymentAmountAlgos =
               Math.round(((entry.value.uint ?? 0) / 1_000_000) * 1e6) / 1e6;
             break;
-          case 'nft_minted':
-            registration.nftMinted = Boolean(entry.value.uint);
+          case 'nft_asset_id':
+            registration.nftAssetId = Number(entry.value.uint ?? 0) || undefined;
             break;
           default:
             break;
@@ -704,6 +724,7 @@ class DynaQRAlgorandService {
           paymentAmountMicroAlgos: registration.paymentAmountMicroAlgos,
           paymentAmountAlgos: registration.paymentAmountAlgos,
           nftMinted: registration.nftMinted,
+          nftAssetId: registration.nftAssetId,
           metadata
         });
       }
@@ -815,13 +836,8 @@ class DynaQRAlgorandService {
     const events = new Map<string, Map<string, { type: number; bytes?: string; uint?: number }>>();
 
     globalState.forEach((entry: any) => {
-      const key = this.decodeStateKey(entry.key);
-      const suffix = EVENT_GLOBAL_SUFFIXES.find((s) => key.endsWith(s));
-      if (!suffix) return;
-
-      const rawEventId = key.slice(0, key.length - suffix.length);
-      const eventId = rawEventId.endsWith('::') ? rawEventId.slice(0, -2) : rawEventId;
-      if (!eventId) return;
+      const { eventId, suffix } = this.decodeStateKey(entry.key, EVENT_GLOBAL_TAGS);
+      if (!suffix || !eventId) return;
 
       const eventState = events.get(eventId) || new Map();
       eventState.set(suffix, entry.value);
@@ -840,16 +856,17 @@ class DynaQRAlgorandService {
     const currentUrl = this.decodeBytesValue(state.get('current_url')) || metadata?.resolverUrl || '';
     const accessType = (this.decodeBytesValue(state.get('access_type')) as AccessType) || 'public';
     const owner = this.decodeAddress(state.get('owner')) || '';
-    const scanCount = this.decodeUintValue(state.get('scan_count'));
-    const active = this.decodeUintValue(state.get('active')) === 1;
-    const ticketPriceMicro = this.decodeUintValue(state.get('ticket_price'));
-    const maxCapacity = this.decodeUintValue(state.get('max_capacity'));
-    const registeredCount = this.decodeUintValue(state.get('registered_count'));
-    const nftAssetIdValue = this.decodeUintValue(state.get('nft_asset_id'));
+    const meta = this.decodeBytes(state.get('meta'));
+    const scanCount = this.decodeMetaField(meta, 'scan_count');
+    const active = this.decodeMetaField(meta, 'active') === 1;
+    const ticketPriceMicro = this.decodeMetaField(meta, 'ticket_price');
+    const maxCapacity = this.decodeMetaField(meta, 'max_capacity');
+    const registeredCount = this.decodeMetaField(meta, 'registered_count');
+    const nftAssetIdValue = this.decodeMetaField(meta, 'nft_asset_id');
     const createdAt =
-      this.toISOString(this.decodeUintValue(state.get('created_at'))) ||
+      this.toISOString(this.decodeMetaField(meta, 'created_at')) ||
       new Date(0).toISOString();
-    const expiryDateValue = this.decodeUintValue(state.get('expiry_date'));
+    const expiryDateValue = this.decodeMetaField(meta, 'expiry_date');
 
     return {
       eventId,
@@ -872,8 +889,15 @@ class DynaQRAlgorandService {
     };
   }
 
-  private decodeStateKey(key: string): string {
-    return textDecoder.decode(this.base64ToUint8Array(key));
+  private decodeStateKey(
+    key: string,
+    tags: Record<number, string>
+  ): { eventId: string; suffix?: string } {
+    const bytes = this.base64ToUint8Array(key);
+    return {
+      eventId: textDecoder.decode(bytes.subarray(0, bytes.length - 1)),
+      suffix: tags[bytes[bytes.length - 1]]
+    };
   }
 
   private decodeBytesValue(entry?: { type: number; bytes?: string }): string | undefined {
@@ -891,9 +915,19 @@ class DynaQRAlgorandService {
     }
   }
 
-  private decodeUintValue(entry?: { type: number; uint?: number }): number {
-    if (!entry || entry.type !== 2) return 0;
-    return Number(entry.uint ?? 0);
+  private decodeBytes(entry?: { type: number; bytes?: string }): Uint8Array | undefined {
+    if (!entry || entry.type !== 1 || !entry.bytes) return undefined;
+    return this.base64ToUint8Array(entry.bytes);
+  }
+
+  private decodeMetaField(
+    meta: Uint8Array | undefined,
+    field: keyof typeof EVENT_META_OFFSETS
+  ): number {
+    const offset = EVENT_META_OFFSETS[field];
+    if (!meta || meta.length < offset + 8) return 0;
+    const view = new DataView(meta.buffer, meta.byteOffset, meta.byteLength);
+    return Number(view.getBigUint64(offset));
   }
 
   private base64ToUint8Array(value: string): Uint8Array {